@@ -1,11 +1,13 @@
 from __future__ import annotations
+from bisect import bisect_right
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import List, Sequence, TypedDict, Any, Tuple
-from zoneinfo import ZoneInfo
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List, TypedDict, Any, Tuple
 
-from .timeparse import parse_query_to_windows, parse_slot_intent
-from .config import settings
+from .timeparse import get_tz, parse_query_to_windows, parse_slot_intent
+from .config import get_settings, settings
 from .logging import get_logger
 log = get_logger(__name__)
 
@@ -17,7 +19,7 @@ class _EventDict(TypedDict, total=False):
     all_day: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class BusyBlock:
     title: str
     start: datetime
@@ -33,73 +35,141 @@ class AvailabilityResult:
     suggested_slots: List[dict]   # may be []
 
 
-def _parse_iso(dt_str: str, tz: ZoneInfo) -> datetime:
-    dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+def _parse_iso(dt_str: str, tz: tzinfo) -> datetime:
+    # fromisoformat accepts "Z" natively on 3.11+, so no string rewrite is needed
+    dt = datetime.fromisoformat(dt_str)
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=tz)
+        return dt.replace(tzinfo=tz)
+    if dt.tzinfo is tz:
+        return dt
     return dt.astimezone(tz)
 
 
+def _try_parse_iso(dt_str: Any, tz: tzinfo) -> datetime | None:
+    """_parse_iso that returns None for malformed/non-string values instead of raising."""
+    try:
+        return _parse_iso(dt_str, tz)
+    except (TypeError, ValueError):
+        return None
+
+
+# Edge policy is resolved once; call reload_edge_policy() after changing settings.
+_EDGE_INCLUSIVE = getattr(settings, "AVAILABILITY_EDGE_POLICY", "exclusive_end") == "inclusive"
+
+
+def reload_edge_policy() -> None:
+    global _EDGE_INCLUSIVE
+    _EDGE_INCLUSIVE = getattr(get_settings(), "AVAILABILITY_EDGE_POLICY", "exclusive_end") == "inclusive"
+
+
 def _overlap(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
-    if getattr(settings, "AVAILABILITY_EDGE_POLICY", "exclusive_end") == "inclusive":
+    if _EDGE_INCLUSIVE:
         return a_start <= b_end and b_start <= a_end
     return (a_start < b_end) and (b_start < a_end)
 
 
-def events_from_context_items(items: Sequence[Any]) -> List[_EventDict]:
-    out: List[_EventDict] = []
+def _extract(it: Any) -> _EventDict | None:
+    """Calendar event fields from a dict or ContextItem-like object, else None."""
+    get = it.get if isinstance(it, dict) else lambda k, d=None: getattr(it, k, d)
+    if get("source") != "calendar":
+        return None
+    md = get("metadata") or {}
+    if "start" not in md or "end" not in md:
+        return None
+    return {
+        "title": md.get("title") or get("title", "calendar event"),
+        "start": md["start"],
+        "end": md["end"],
+        "all_day": bool(md.get("all_day", False)),
+    }
+
+
+def events_from_context_items(items: Iterable[Any]) -> Iterator[_EventDict]:
+    """Lazily yield calendar events; wrap in list() if you need to iterate twice."""
     for it in items:
-        if isinstance(it, dict):
-            if it.get("source") != "calendar":
-                continue
-            md = it.get("metadata") or {}
-            if "start" in md and "end" in md:
-                out.append({
-                    "title": md.get("title") or it.get("title", "calendar event"),
-                    "start": md["start"],
-                    "end": md["end"],
-                    "all_day": bool(md.get("all_day", False)),
-                })
-            continue
+        ev = _extract(it)
+        if ev is not None:
+            yield ev
 
-        if getattr(it, "source", None) != "calendar":
-            continue
-        md = getattr(it, "metadata", None) or {}
-        if "start" in md and "end" in md:
-            out.append({
-                "title": md.get("title") or getattr(it, "title", "calendar event"),
-                "start": md["start"],
-                "end": md["end"],
-                "all_day": bool(md.get("all_day", False)),
-            })
-    return out
-
-
-def _merge_overlaps(blocks: List[BusyBlock]) -> List[BusyBlock]:
-    if not blocks:
+
+def _normalize_blocks(blocks: List[BusyBlock]) -> List[BusyBlock]:
+    """Expand all-day blocks to civil days, sort and merge in one pass (input is left untouched)."""
+    spans: List[Tuple[datetime, datetime, str, bool]] = []
+    for b in blocks:
+        if b.all_day:
+            d0 = b.start.replace(hour=0, minute=0, second=0, microsecond=0)
+            spans.append((d0, d0 + timedelta(days=1), b.title, True))
+        else:
+            spans.append((b.start, b.end, b.title, False))
+    if not spans:
         return []
-    blocks = sorted(blocks, key=lambda b: (b.start, b.end))
-    merged: List[BusyBlock] = [blocks[0]]
-    for b in blocks[1:]:
-        last = merged[-1]
-        if _overlap(last.start, last.end, b.start, b.end) or last.end == b.start:
-            if b.end > last.end:
-                last.end = b.end
+    spans.sort(key=lambda sp: (sp[0], sp[1]))
+
+    merged: List[BusyBlock] = []
+    cur_start, cur_end, cur_title, cur_all_day = spans[0]
+    for start, end, title, all_day in islice(spans, 1, None):
+        if _overlap(cur_start, cur_end, start, end) or cur_end == start:
+            if end > cur_end:
+                cur_end = end
         else:
-            merged.append(b)
+            merged.append(BusyBlock(cur_title, cur_start, cur_end, all_day=cur_all_day))
+            cur_start, cur_end, cur_title, cur_all_day = start, end, title, all_day
+    merged.append(BusyBlock(cur_title, cur_start, cur_end, all_day=cur_all_day))
     return merged
 
 
+@lru_cache(maxsize=4)
+def _work_hours(start: str, end: str) -> Tuple[timedelta, timedelta]:
+    sh, sm = map(int, start.split(":"))
+    eh, em = map(int, end.split(":"))
+    return timedelta(hours=sh, minutes=sm), timedelta(hours=eh, minutes=em)
+
+
 def _work_window_for(day: datetime, cfg) -> Tuple[datetime, datetime]:
-    sh, sm = map(int, getattr(cfg, "WORK_HOURS_START", "09:00").split(":"))
-    eh, em = map(int, getattr(cfg, "WORK_HOURS_END", "18:00").split(":"))
-    start = day.replace(hour=sh, minute=sm, second=0, microsecond=0)
-    end = day.replace(hour=eh, minute=em, second=0, microsecond=0)
-    return start, end
+    # keyed on the raw strings (not id(cfg)) so a changed/replaced cfg can't hit a stale entry
+    start_td, end_td = _work_hours(
+        getattr(cfg, "WORK_HOURS_START", "09:00"),
+        getattr(cfg, "WORK_HOURS_END", "18:00"),
+    )
+    midnight = day.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight + start_td, midnight + end_td
+
+
+@dataclass(slots=True)
+class _BusyIndex:
+    """Merged blocks plus parallel epoch-second arrays, so slot scans compare floats."""
+    blocks: List[BusyBlock]
+    starts: List[float]
+    ends: List[float]
+
+
+def _index_blocks(blocks: List[BusyBlock]) -> _BusyIndex:
+    """`blocks` must already be normalized (sorted, merged) — see _normalize_blocks."""
+    return _BusyIndex(
+        blocks,
+        [b.start.timestamp() for b in blocks],
+        [b.end.timestamp() for b in blocks],
+    )
+
+
+def _slot_iso(dt: datetime) -> str:
+    # Most slots start on a whole minute; one that starts at a busy block's
+    # end keeps that event's seconds, which must not be truncated away.
+    if dt.second or dt.microsecond:
+        return dt.isoformat()
+    return dt.isoformat(timespec="minutes")
+
+
+def _slot(start: datetime, duration_min: int) -> dict:
+    return {
+        "start": _slot_iso(start),
+        "end": _slot_iso(start + timedelta(minutes=duration_min)),
+        "reason": "earliest free segment",
+    }
 
 
 def _suggest_slots_in_window(
-    blocks: List[BusyBlock],
+    index: _BusyIndex,
     win_start: datetime,
     win_end: datetime,
     duration_min: int,
@@ -107,77 +177,74 @@ def _suggest_slots_in_window(
 ) -> List[dict]:
     """Return earliest free slots (start,end) within [win_start, win_end)."""
     suggestions: List[dict] = []
-    cursor = win_start
-
-    for b in blocks:
-        # skip blocks fully outside window
-        if b.end <= win_start or b.start >= win_end:
-            continue
+    need = duration_min * 60
+    win_start_ts = win_start.timestamp()
+    win_end_ts = win_end.timestamp()
+    cursor, cursor_ts = win_start, win_start_ts
+
+    # ends are monotonic for merged blocks: jump to the first one ending after win_start
+    first = bisect_right(index.ends, win_start_ts)
+    for i in range(first, len(index.blocks)):
+        start_ts = index.starts[i]
+        if start_ts >= win_end_ts:
+            break
 
         # free segment from cursor to the start of this busy block
-        if cursor < b.start:
-            seg_end = min(b.start, win_end)
-            if seg_end - cursor >= timedelta(minutes=duration_min):
-                suggestions.append({
-                    "start": cursor.isoformat(),
-                    "end": (cursor + timedelta(minutes=duration_min)).isoformat(),
-                    "reason": "earliest free segment",
-                })
-                if len(suggestions) >= max_suggestions:
-                    return suggestions
+        if cursor_ts < start_ts and min(start_ts, win_end_ts) - cursor_ts >= need:
+            suggestions.append(_slot(cursor, duration_min))
+            if len(suggestions) >= max_suggestions:
+                return suggestions
 
         # advance cursor past this busy block
-        cursor = max(cursor, b.end)
-        if cursor >= win_end:
+        if index.ends[i] > cursor_ts:
+            cursor, cursor_ts = index.blocks[i].end, index.ends[i]
+        if cursor_ts >= win_end_ts:
             break
 
     # tail segment after the last busy block
-    if cursor < win_end and (win_end - cursor) >= timedelta(minutes=duration_min):
-        suggestions.append({
-            "start": cursor.isoformat(),
-            "end": (cursor + timedelta(minutes=duration_min)).isoformat(),
-            "reason": "earliest free segment",
-        })
+    if cursor_ts < win_end_ts and win_end_ts - cursor_ts >= need:
+        suggestions.append(_slot(cursor, duration_min))
 
     return suggestions
 
 
-def suggest_slots(query_text: str, events: List[_EventDict], cfg, max_suggestions: int = 2) -> List[dict]:
-    """Parses slot intent and returns suggested free slots or []."""
-    # tz (Windows-safe)
-    try:
-        tz = ZoneInfo(cfg.DEFAULT_TZ)
-    except Exception:
-        from dateutil.tz import tzlocal
-        tz = tzlocal()
+def _events_to_blocks(events: Iterable[_EventDict], tz: tzinfo) -> List[BusyBlock]:
+    """Parse calendar events into BusyBlocks in `tz`, skipping malformed ones."""
+    blocks: List[BusyBlock] = []
+    for ev in events:
+        if "start" not in ev or "end" not in ev:
+            continue
+        s = _try_parse_iso(ev["start"], tz)
+        e = _try_parse_iso(ev["end"], tz)
+        if s is None or e is None:
+            continue
+        blocks.append(BusyBlock(
+            title=ev.get("title", "event"),
+            start=s, end=e,
+            all_day=bool(ev.get("all_day", False)),
+        ))
+    return blocks
+
+
+def suggest_slots(
+    query_text: str,
+    events: List[_EventDict],
+    cfg,
+    max_suggestions: int = 2,
+    *,
+    _index: _BusyIndex | None = None,
+) -> List[dict]:
+    """Parses slot intent and returns suggested free slots or [].
+
+    `_index` lets decide_availability hand over its already-normalized blocks.
+    """
+    tz = get_tz(cfg.DEFAULT_TZ)
 
     intent = parse_slot_intent(query_text, tz=tz)
     if not intent:
         return []
 
-    # normalize events
-    blocks: List[BusyBlock] = []
-    for ev in events:
-        try:
-            s = _parse_iso(ev["start"], tz)
-            e = _parse_iso(ev["end"], tz)
-            blocks.append(BusyBlock(
-                title=ev.get("title", "event"),
-                start=s, end=e,
-                all_day=bool(ev.get("all_day", False)),
-            ))
-        except Exception:
-            continue
-
-    # expand all-day to full-day blocks
-    expanded: List[BusyBlock] = []
-    for b in blocks:
-        if b.all_day:
-            d0 = b.start.replace(hour=0, minute=0, second=0, microsecond=0)
-            expanded.append(BusyBlock(b.title, d0, d0 + timedelta(days=1), all_day=True))
-        else:
-            expanded.append(b)
-    blocks = _merge_overlaps(expanded)
+    index = _index if _index is not None else _index_blocks(_normalize_blocks(_events_to_blocks(events, tz)))
 
     if intent["mode"] == "after_time":
         after: datetime = intent["after"]
@@ -185,7 +252,7 @@ def suggest_slots(query_text: str, events: List[_EventDict], cfg, max_suggestion
         day_start, day_end = _work_window_for(after, cfg)
         win_start = max(after, day_start)
         win_end = day_end
-        return _suggest_slots_in_window(blocks, win_start, win_end, dur, max_suggestions)
+        return _suggest_slots_in_window(index, win_start, win_end, dur, max_suggestions)
 
     if intent["mode"] == "day_window":
         start: datetime = intent["start"]
@@ -196,7 +263,7 @@ def suggest_slots(query_text: str, events: List[_EventDict], cfg, max_suggestion
         win_end = min(end, we)
         if win_end <= win_start:
             return []
-        return _suggest_slots_in_window(blocks, win_start, win_end, dur, max_suggestions)
+        return _suggest_slots_in_window(index, win_start, win_end, dur, max_suggestions)
 
     return []
 
@@ -209,49 +276,21 @@ def decide_availability(query_text: str, events: List[_EventDict], cfg) -> Avail
     - When RANGE queries are free and a duration was requested, suggests earliest slots in window.
     - If no window was parsed, treats it as a slot-finding query via parse_slot_intent().
     """
-    # --- timezone (Windows-safe) ---
-    try:
-        tz = ZoneInfo(cfg.DEFAULT_TZ)
-    except Exception:
-        from dateutil.tz import tzlocal
-        tz = tzlocal()
+    # --- timezone (cached, Windows-safe) ---
+    tz = get_tz(cfg.DEFAULT_TZ)
 
     # --- try direct free/busy window first ---
     windows = parse_query_to_windows(query_text, tz=tz)
 
     # Normalize calendar events → BusyBlock[]
-    blocks: List[BusyBlock] = []
-    for ev in events:
-        try:
-            s = _parse_iso(ev["start"], tz)
-            e = _parse_iso(ev["end"], tz)
-            blocks.append(
-                BusyBlock(
-                    title=ev.get("title", "event"),
-                    start=s,
-                    end=e,
-                    all_day=bool(ev.get("all_day", False)),
-                )
-            )
-        except Exception:
-            continue
+    blocks = _events_to_blocks(events, tz)
 
-    # Helper to expand all-day blocks to civil-day spans for slot math
-    def _expand_all_day(bs: List[BusyBlock]) -> List[BusyBlock]:
-        out: List[BusyBlock] = []
-        for b in bs:
-            if b.all_day:
-                d0 = b.start.replace(hour=0, minute=0, second=0, microsecond=0)
-                out.append(BusyBlock(b.title, d0, d0 + timedelta(days=1), all_day=True))
-            else:
-                out.append(b)
-        return out
-
-    blocks_for_slots = _merge_overlaps(_expand_all_day(blocks))
+    # Merged, all-day-expanded view for slot math (raw blocks stay intact for conflicts)
+    slot_index = _index_blocks(_normalize_blocks(blocks))
 
     # If no explicit free/busy window parsed, try pure slot intent (e.g., "book 30 min after 15:00 today")
     if not windows:
-        suggestions = suggest_slots(query_text, events, cfg)
+        suggestions = suggest_slots(query_text, events, cfg, _index=slot_index)
         if suggestions:
             return AvailabilityResult("unknown", [], "Suggested slots available.", suggestions)
         return AvailabilityResult("unknown", [], "Could not resolve a specific time window.", [])
@@ -259,29 +298,33 @@ def decide_availability(query_text: str, events: List[_EventDict], cfg) -> Avail
     # We have a window
     w_start, w_end = windows[0]
     point_mode = (w_start == w_end)
+    slot_intent = parse_slot_intent(query_text, tz=tz)
 
     # --- conflict detection (handles all-day distinctly) ---
-    conflicting: List[BusyBlock] = []
+    # Effective spans sorted by start; only spans starting at/before w_end can conflict,
+    # and conflicts come out already in display order.
+    # (Ends aren't monotonic for unmerged blocks, so there's no lower bound to bisect to.)
+    spans: List[Tuple[datetime, datetime, BusyBlock]] = []
     for b in blocks:
         if b.all_day:
             day_start = b.start.replace(hour=0, minute=0, second=0, microsecond=0)
-            day_end = day_start + timedelta(days=1)
-            if point_mode:
-                if day_start <= w_start < day_end:
-                    conflicting.append(b)
-            else:
-                if _overlap(w_start, w_end, day_start, day_end):
-                    conflicting.append(b)
+            spans.append((day_start, day_start + timedelta(days=1), b))
         else:
-            if point_mode:
-                if b.start <= w_start < b.end:
-                    conflicting.append(b)
-            else:
-                if _overlap(w_start, w_end, b.start, b.end):
-                    conflicting.append(b)
+            spans.append((b.start, b.end, b))
+    spans.sort(key=lambda sp: (sp[0], sp[2].start, sp[2].end))
+    last = bisect_right(spans, w_end, key=lambda sp: sp[0])
+
+    conflicting: List[BusyBlock] = []
+    for s_start, s_end, b in islice(spans, last):
+        if point_mode:
+            if s_start <= w_start < s_end:
+                conflicting.append(b)
+        elif _overlap(w_start, w_end, s_start, s_end):
+            conflicting.append(b)
 
     if conflicting:
-        # shape conflicts
+        # shape conflicts (already sorted by the span scan)
+        first = conflicting[0]
         conflicts_out = [
             {
                 "title": c.title,
@@ -290,25 +333,24 @@ def decide_availability(query_text: str, events: List[_EventDict], cfg) -> Avail
                 "all_day": c.all_day,
                 "source": "calendar",
             }
-            for c in sorted(conflicting, key=lambda x: (x.start, x.end))
+            for c in conflicting
         ]
 
         if point_mode:
             return AvailabilityResult(
                 "busy",
                 conflicts_out,
-                f"Conflicts with {conflicts_out[0]['title']} at {conflicts_out[0]['start'][11:16]}.",
+                f"Conflicts with {first.title} at {first.start:%H:%M}.",
                 []
             )
 
         # RANGE conflict: suggest earliest in-window slots honoring requested duration (default 30)
-        slot_intent = parse_slot_intent(query_text, tz=tz)
         requested_dur = 30
         if slot_intent and slot_intent.get("mode") == "day_window":
             requested_dur = int(slot_intent.get("duration_min", 30))
 
         suggestions_in_window = _suggest_slots_in_window(
-            blocks_for_slots,            # merged & all-day-expanded
+            slot_index,                  # merged & all-day-expanded
             w_start,
             w_end,
             duration_min=requested_dur,
@@ -318,17 +360,15 @@ def decide_availability(query_text: str, events: List[_EventDict], cfg) -> Avail
         return AvailabilityResult(
             "busy",
             conflicts_out,
-            f"Conflicts with {conflicts_out[0]['title']} "
-            f"{conflicts_out[0]['start'][11:16]}–{conflicts_out[0]['end'][11:16]}.",
+            f"Conflicts with {first.title} {first.start:%H:%M}–{first.end:%H:%M}.",
             suggestions_in_window,
         )
 
     # No conflicts → free. If the user asked for a duration in a RANGE, propose earliest slots in window.
-    slot_intent = parse_slot_intent(query_text, tz=tz)
     if slot_intent and slot_intent.get("mode") == "day_window":
         dur = int(slot_intent.get("duration_min", 30))
         suggestions_if_free = _suggest_slots_in_window(
-            blocks_for_slots,
+            slot_index,
             w_start,
             w_end,
             duration_min=dur,
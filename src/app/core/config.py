@@ -1,4 +1,5 @@
 ﻿from __future__ import annotations
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -22,17 +23,9 @@ class Settings(BaseSettings):
         extra="ignore",  # ignore stray vars rather than erroring
     )
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    # one .env parse per process; tests can get_settings.cache_clear() to re-read env
+    return Settings()
 
-class Settings(BaseSettings):
-    APP_ENV: str = "local"
-    NOTION_TOKEN: str | None = None
-    GITHUB_TOKEN: str | None = None
-    CALENDAR_ICS_URL: str | None = None
-    OPENAI_API_KEY: str | None = None
-
-    # NEW: availability defaults (override in .env as needed)
-    DEFAULT_TZ: str = "America/Chicago"         # e.g., "America/Chicago"
-    WORK_HOURS_START: str = "09:00"
-    WORK_HOURS_END: str = "18:00"
-    AVAILABILITY_EDGE_POLICY: str = "exclusive_end"  # or "inclusive"
+settings = get_settings()  # compatibility alias for `from .config import settings`
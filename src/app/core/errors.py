@@ -6,13 +6,17 @@ import traceback
 
 log = get_logger(__name__)
 
+_TRACE_LIMIT = 20  # frames; keeps local 500s cheap when many fail at once
+
 def install_exception_handlers(app: FastAPI) -> None:
+    is_local = settings.APP_ENV == "local"  # resolved once, not per request
+
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(request: Request, exc: Exception):
         # Always log full details to console
         log.exception("unhandled.exception")
 
-        if settings.APP_ENV == "local":
+        if is_local:
             # In local mode, show rich diagnostics
             return JSONResponse(
                 status_code=500,
@@ -20,7 +24,9 @@ def install_exception_handlers(app: FastAPI) -> None:
                     "error": "internal_server_error",
                     "type": exc.__class__.__name__,
                     "message": str(exc),
-                    "trace": traceback.format_exc(),
+                    "trace": "".join(
+                        traceback.format_exception(type(exc), exc, exc.__traceback__, limit=_TRACE_LIMIT)
+                    ),
                 },
             )
 
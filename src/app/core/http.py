@@ -0,0 +1,23 @@
+from __future__ import annotations
+import httpx
+
+# One pooled client per process so providers reuse keep-alive connections
+# instead of paying a TCP+TLS handshake on every fetch.
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _client
+
+
+async def aclose_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
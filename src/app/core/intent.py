@@ -1,23 +1,35 @@
 from __future__ import annotations
+import re
+from functools import lru_cache
 
+# Calendar-like keywords (free/busy, slots, booking)
+_CAL_TERMS = (
+    "am i free",
+    "free at", "busy at",
+    "tomorrow", "today", "next ",
+    "slot", "book", "schedule", "reschedule",
+    "morning", "afternoon", "evening",
+)
+_NOTES_TERMS = ("notion", "notes", "meeting notes")
+_CODE_TERMS = ("github", "pr ", "issue ")
+
+# One alternation per category: a single C-level scan instead of a Python `in` per keyword.
+_CAL_RE = re.compile("|".join(map(re.escape, _CAL_TERMS)))
+_NOTES_RE = re.compile("|".join(map(re.escape, _NOTES_TERMS)))
+_CODE_RE = re.compile("|".join(map(re.escape, _CODE_TERMS)))
+
+
+@lru_cache(maxsize=8192)
 def classify_intent(text: str) -> str:
     s = (text or "").lower()
 
-    # Calendar-like keywords (free/busy, slots, booking)
-    cal_terms = (
-        "am i free",
-        "free at", "busy at",
-        "tomorrow", "today", "next ",
-        "slot", "book", "schedule", "reschedule",
-        "morning", "afternoon", "evening",
-    )
-    if any(t in s for t in cal_terms):
+    if _CAL_RE.search(s):
         return "calendar"
 
     # Light heuristics for others
-    if "notion" in s or "notes" in s or "meeting notes" in s:
+    if _NOTES_RE.search(s):
         return "notes"
-    if "github" in s or "pr " in s or "issue " in s:
+    if _CODE_RE.search(s):
         return "code"
 
     return "general"
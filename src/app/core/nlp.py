@@ -1,5 +1,6 @@
 # src/app/core/nlp.py
 from __future__ import annotations
+import re
 from dataclasses import dataclass
 from typing import List, Dict
 
@@ -7,6 +8,25 @@ CALENDAR_KWS = {"free", "busy", "meeting", "schedule", "calendar", "tomorrow", "
 NOTION_KWS   = {"notes", "meeting notes", "decisions", "retro", "action items", "doc", "wiki", "page"}
 GITHUB_KWS   = {"issue", "issues", "pr", "pull", "pipeline", "deploy", "status", "prod", "bug", "cpu"}
 
+def _kw_matcher(kws: set[str]) -> tuple[re.Pattern[str], dict[str, frozenset[str]]]:
+    # Longest-first lookahead alternation reports one keyword per start position;
+    # shorter keywords sharing that start (e.g. "issue" in "issues") are recovered
+    # via the substring map, so counts match the old `k in text` scan exactly.
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, sorted(kws, key=len, reverse=True))) + "))")
+    covers = {k: frozenset(j for j in kws if j in k) for k in kws}
+    return pattern, covers
+
+def _count_kws(text: str, matcher: tuple[re.Pattern[str], dict[str, frozenset[str]]]) -> int:
+    pattern, covers = matcher
+    hit: set[str] = set()
+    for k in pattern.findall(text):
+        hit |= covers[k]
+    return len(hit)
+
+_CALENDAR_M = _kw_matcher(CALENDAR_KWS)
+_NOTION_M   = _kw_matcher(NOTION_KWS)
+_GITHUB_M   = _kw_matcher(GITHUB_KWS)
+
 @dataclass
 class Intent:
     name: str
@@ -15,10 +35,12 @@ class Intent:
 def detect_intent(q: str) -> Intent:
     text = (q or "").lower()
 
-    score = {"calendar": 0, "notion": 0, "github": 0}
-    score["calendar"] += sum(k in text for k in CALENDAR_KWS)
-    score["notion"]   += sum(k in text for k in NOTION_KWS)
-    score["github"]   += sum(k in text for k in GITHUB_KWS)
+    # score = number of distinct keywords present, one regex pass per category
+    score = {
+        "calendar": _count_kws(text, _CALENDAR_M),
+        "notion":   _count_kws(text, _NOTION_M),
+        "github":   _count_kws(text, _GITHUB_M),
+    }
 
     if max(score.values()) == 0:
         return Intent(name="general", sources=["calendar", "notion", "github"])
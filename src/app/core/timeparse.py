@@ -1,25 +1,68 @@
 from __future__ import annotations
 import re
-from datetime import datetime, timedelta, time
+import time as _time
+from datetime import datetime, timedelta, time, tzinfo
+from functools import lru_cache
 from typing import List, Tuple, Optional, Dict, Any
 from zoneinfo import ZoneInfo
 
+@lru_cache(maxsize=64)
+def get_tz(name: str) -> tzinfo:
+    """Cached tz lookup; falls back to the machine's local zone (Windows-safe)."""
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        from dateutil.tz import tzlocal
+        return tzlocal()
+
 _DAY_MAP = {
     "mon": 0, "tue": 1, "wed": 2, "thu": 3, "thur": 3, "thurs": 3,
     "fri": 4, "sat": 5, "sun": 6
 }
 
+# Patterns are matched against lower-cased input; compiled once at import.
+_RE_TT_HM = re.compile(r"\b(tomorrow|today)\s+(?:at\s+)?(\d{1,2})(?::(\d{2}))?\b")
+_RE_NEXT_WD_RANGE = re.compile(
+    r"\bnext\s+(mon|tue|wed|thu|thur|thurs|fri|sat|sun)\s+"
+    r"(\d{1,2})(?::(\d{2}))?\s*[–-]\s*(\d{1,2})(?::(\d{2}))?\b"
+)
+_RE_TT_DAYPART = re.compile(r"\b(today|tomorrow)\s+(morning|afternoon|evening)\b")
+_RE_AT_HM = re.compile(r"\bat\s+(\d{1,2})(?::(\d{2}))?\b")
+
+_RE_DUR = re.compile(r"\b(?:book|find|schedule)\s+(\d{1,3})\s*(?:min(?:ute)?s?|m)\b")
+_RE_AFTER = re.compile(r"\bafter\b")
+_RE_TAIL_A = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?(?:\s+(today|tomorrow))?\b")
+_RE_TAIL_B = re.compile(r"^\s*(today|tomorrow)\s+(\d{1,2})(?::(\d{2}))?\b")
+_RE_TAIL_C = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?\b")
+_RE_ANY_SLOT_WD = re.compile(
+    r"\bany\s+slot\s+(this|next)\s+(mon|tue|wed|thu|thur|thurs|fri|sat|sun)"
+    r"(?:\s+(morning|afternoon|evening))?(?:\s+for\s+(\d{1,3})\s*(?:min(?:ute)?s?|m))?"
+)
+_RE_ANY_SLOT_DAY = re.compile(
+    r"\bany\s+slot\s+(today|tomorrow)(?:\s+(morning|afternoon|evening))?"
+    r"(?:\s+for\s+(\d{1,3})\s*(?:min(?:ute)?s?|m))?"
+)
+
 def _next_weekday(base: datetime, target_wd: int) -> datetime:
     days_ahead = (target_wd - base.weekday() + 7) % 7
     if days_ahead == 0:
         days_ahead = 7
     return base + timedelta(days=days_ahead)
 
+def _at(midnight: datetime, t: time) -> datetime:
+    # timedelta add on a midnight anchor instead of a full .replace(...) per result
+    return midnight + timedelta(hours=t.hour, minutes=t.minute)
+
 def _parse_24h(hh: int, mm: int) -> time:
     hh = max(0, min(23, hh))
     mm = max(0, min(59, mm))
     return time(hh, mm, 0)
 
+def _minute_bucket() -> int:
+    # Parse results only depend on the calendar date of "now" (times are
+    # zeroed to the minute), so a per-minute cache key is always safe.
+    return int(_time.time() // 60)
+
 def _daypart_bounds(label: str) -> tuple[time, time]:
     label = label.lower()
     if label == "morning":
@@ -33,7 +76,7 @@ def _daypart_bounds(label: str) -> tuple[time, time]:
 # -----------------------
 # Availability windows (was already used by M3 free/busy)
 # -----------------------
-def parse_query_to_windows(text: str, tz: ZoneInfo, cfg=None) -> List[Tuple[datetime, datetime]]:
+def parse_query_to_windows(text: str, tz: tzinfo, cfg=None) -> List[Tuple[datetime, datetime]]:
     """
     Strict 24h clock.
 
@@ -43,55 +86,59 @@ def parse_query_to_windows(text: str, tz: ZoneInfo, cfg=None) -> List[Tuple[date
       - "today afternoon", "tomorrow morning"
       - "at 23" (today point)
     """
-    now = datetime.now(tz)
+    key = getattr(tz, "key", None)
+    if key is None:  # non-ZoneInfo fallback (e.g. tzlocal) isn't hashable
+        return _parse_query_to_windows(text, datetime.now(tz))
+    return list(_parse_query_to_windows_cached(text, key, _minute_bucket()))
+
+
+@lru_cache(maxsize=4096)
+def _parse_query_to_windows_cached(text: str, tz_name: str, bucket: int) -> Tuple[Tuple[datetime, datetime], ...]:
+    now = datetime.fromtimestamp(bucket * 60, get_tz(tz_name))
+    return tuple(_parse_query_to_windows(text, now))
+
+
+def _parse_query_to_windows(text: str, now: datetime) -> List[Tuple[datetime, datetime]]:
     s = text.strip().lower()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = today + timedelta(days=1)
 
     # today/tomorrow + hh[:mm]
-    m = re.search(r"\b(tomorrow|today)\s+(?:at\s+)?(\d{1,2})(?::(\d{2}))?\b", s)
+    m = _RE_TT_HM.search(s)
     if m:
         day_word, hh, mm = m.group(1), int(m.group(2)), int(m.group(3) or 0)
-        base = now if day_word == "today" else now + timedelta(days=1)
-        t = _parse_24h(hh, mm)
-        start = base.replace(hour=t.hour, minute=t.minute, second=0, microsecond=0)
+        base = today if day_word == "today" else tomorrow
+        start = _at(base, _parse_24h(hh, mm))
         return [(start, start)]
 
     # next <weekday> hh-hh(:mm)?
-    m = re.search(
-        r"\bnext\s+(mon|tue|wed|thu|thur|thurs|fri|sat|sun)\s+"
-        r"(\d{1,2})(?::(\d{2}))?\s*[–-]\s*(\d{1,2})(?::(\d{2}))?\b",
-        s
-    )
+    m = _RE_NEXT_WD_RANGE.search(s)
     if m:
         wd, h1, m1, h2, m2 = (
             m.group(1),
             int(m.group(2)), int(m.group(3) or 0),
             int(m.group(4)), int(m.group(5) or 0),
         )
-        target_day = _next_weekday(now, _DAY_MAP[wd])
-        t1 = _parse_24h(h1, m1)
-        t2 = _parse_24h(h2, m2)
-        start = target_day.replace(hour=t1.hour, minute=t1.minute, second=0, microsecond=0)
-        end = target_day.replace(hour=t2.hour, minute=t2.minute, second=0, microsecond=0)
+        target_day = _next_weekday(today, _DAY_MAP[wd])
+        start = _at(target_day, _parse_24h(h1, m1))
+        end = _at(target_day, _parse_24h(h2, m2))
         if end < start:
             end = start
         return [(start, end)]
 
     # (today|tomorrow) <daypart>
-    m = re.search(r"\b(today|tomorrow)\s+(morning|afternoon|evening)\b", s)
+    m = _RE_TT_DAYPART.search(s)
     if m:
         day_word, label = m.group(1), m.group(2)
-        base = now if day_word == "today" else now + timedelta(days=1)
+        base = today if day_word == "today" else tomorrow
         t1, t2 = _daypart_bounds(label)
-        start = base.replace(hour=t1.hour, minute=t1.minute, second=0, microsecond=0)
-        end = base.replace(hour=t2.hour, minute=t2.minute, second=0, microsecond=0)
-        return [(start, end)]
+        return [(_at(base, t1), _at(base, t2))]
 
     # "at hh[:mm]" (today point)
-    m = re.search(r"\bat\s+(\d{1,2})(?::(\d{2}))?\b", s)
+    m = _RE_AT_HM.search(s)
     if m:
         hh, mm = int(m.group(1)), int(m.group(2) or 0)
-        t = _parse_24h(hh, mm)
-        start = now.replace(hour=t.hour, minute=t.minute, second=0, microsecond=0)
+        start = _at(today, _parse_24h(hh, mm))
         return [(start, start)]
 
     return []
@@ -99,7 +146,7 @@ def parse_query_to_windows(text: str, tz: ZoneInfo, cfg=None) -> List[Tuple[date
 # -----------------------
 # Slot-finding intents (new)
 # -----------------------
-def parse_slot_intent(text: str, tz: ZoneInfo) -> Optional[Dict[str, Any]]:
+def parse_slot_intent(text: str, tz: tzinfo) -> Optional[Dict[str, Any]]:
     """
     Detect 'find me a slot' requests and return a structured request.
 
@@ -110,22 +157,37 @@ def parse_slot_intent(text: str, tz: ZoneInfo) -> Optional[Dict[str, Any]]:
       - "any slot this fri morning"
       - "any slot tomorrow afternoon for 60 min"
     """
+    key = getattr(tz, "key", None)
+    if key is None:
+        return _parse_slot_intent(text, datetime.now(tz))
+    intent = _parse_slot_intent_cached(text, key, _minute_bucket())
+    return dict(intent) if intent is not None else None
+
+
+@lru_cache(maxsize=4096)
+def _parse_slot_intent_cached(text: str, tz_name: str, bucket: int) -> Optional[Dict[str, Any]]:
+    now = datetime.fromtimestamp(bucket * 60, get_tz(tz_name))
+    return _parse_slot_intent(text, now)
+
+
+def _parse_slot_intent(text: str, now: datetime) -> Optional[Dict[str, Any]]:
     s = text.strip().lower()
-    now = datetime.now(tz)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = today + timedelta(days=1)
 
     # -------- Order-agnostic "after <time> [today|tomorrow]" --------
     # First, ensure it's a booking-style command with a duration.
-    dur_m = re.search(r"\b(?:book|find|schedule)\s+(\d{1,3})\s*(?:min(?:ute)?s?|m)\b", s)
-    after_m = re.search(r"\bafter\b", s)
+    dur_m = _RE_DUR.search(s)
+    after_m = _RE_AFTER.search(s)
     if dur_m and after_m:
         dur = int(dur_m.group(1))
         tail = s[after_m.end():].strip()  # text after "after"
 
         # Accept either "15[:00] [today|tomorrow]" OR "(today|tomorrow) 15[:00]"
         # pattern A: time first, optional dayword after
-        mA = re.search(r"^\s*(\d{1,2})(?::(\d{2}))?(?:\s+(today|tomorrow))?\b", tail)
+        mA = _RE_TAIL_A.search(tail)
         # pattern B: dayword first, then time
-        mB = re.search(r"^\s*(today|tomorrow)\s+(\d{1,2})(?::(\d{2}))?\b", tail)
+        mB = _RE_TAIL_B.search(tail)
 
         if mA or mB:
             if mA:
@@ -135,55 +197,45 @@ def parse_slot_intent(text: str, tz: ZoneInfo) -> Optional[Dict[str, Any]]:
                 day_word = mB.group(1)
                 hh = int(mB.group(2)); mm = int(mB.group(3) or 0)
 
-            base = now if (not day_word or day_word == "today") else now + timedelta(days=1)
-            t = _parse_24h(hh, mm)
-            after_dt = base.replace(hour=t.hour, minute=t.minute, second=0, microsecond=0)
+            base = today if (not day_word or day_word == "today") else tomorrow
+            after_dt = _at(base, _parse_24h(hh, mm))
             return {"mode": "after_time", "after": after_dt, "duration_min": dur}
 
         # Fallback: allow just "after 9" with no dayword
-        mC = re.search(r"^\s*(\d{1,2})(?::(\d{2}))?\b", tail)
+        mC = _RE_TAIL_C.search(tail)
         if mC:
             hh = int(mC.group(1)); mm = int(mC.group(2) or 0)
-            t = _parse_24h(hh, mm)
-            after_dt = now.replace(hour=t.hour, minute=t.minute, second=0, microsecond=0)
+            after_dt = _at(today, _parse_24h(hh, mm))
             return {"mode": "after_time", "after": after_dt, "duration_min": dur}
 
     # -------- Any slot this/next <weekday> (daypart)? [for <dur> min] --------
-    m = re.search(
-        r"\bany\s+slot\s+(this|next)\s+(mon|tue|wed|thu|thur|thurs|fri|sat|sun)"
-        r"(?:\s+(morning|afternoon|evening))?(?:\s+for\s+(\d{1,3})\s*(?:min(?:ute)?s?|m))?",
-        s
-    )
+    m = _RE_ANY_SLOT_WD.search(s)
     if m:
         this_next, wd, daypart, dur = m.group(1), m.group(2), m.group(3), m.group(4)
-        target = now if this_next == "this" else now + timedelta(days=7)
+        target = today if this_next == "this" else today + timedelta(days=7)
         base = _next_weekday(target, _DAY_MAP[wd])
         duration = int(dur) if dur else 30
         if daypart:
             start_t, end_t = _daypart_bounds(daypart)
-            day_start = base.replace(hour=start_t.hour, minute=start_t.minute, second=0, microsecond=0)
-            day_end = base.replace(hour=end_t.hour, minute=end_t.minute, second=0, microsecond=0)
+            day_start = _at(base, start_t)
+            day_end = _at(base, end_t)
         else:
-            day_start = base.replace(hour=0, minute=0, second=0, microsecond=0)
-            day_end = base.replace(hour=23, minute=59, second=0, microsecond=0)
+            day_start = base
+            day_end = _at(base, time(23, 59))
         return {"mode": "day_window", "start": day_start, "end": day_end, "duration_min": duration}
 
     # -------- Any slot (today|tomorrow) (daypart)? [for <dur> min] --------
-    m = re.search(
-        r"\bany\s+slot\s+(today|tomorrow)(?:\s+(morning|afternoon|evening))?(?:\s+for\s+(\d{1,3})\s*(?:min(?:ute)?s?|m))?",
-        s
-    )
+    m = _RE_ANY_SLOT_DAY.search(s)
     if m:
         day_word, daypart, dur = m.group(1), m.group(2), m.group(3)
-        base = now if day_word == "today" else now + timedelta(days=1)
+        base = today if day_word == "today" else tomorrow
         duration = int(dur) if dur else 30
         if daypart:
             t1, t2 = _daypart_bounds(daypart)
-            start = base.replace(hour=t1.hour, minute=t1.minute, second=0, microsecond=0)
-            end = base.replace(hour=t2.hour, minute=t2.minute, second=0, microsecond=0)
         else:
-            start = base.replace(hour=9, minute=0, second=0, microsecond=0)
-            end = base.replace(hour=18, minute=0, second=0, microsecond=0)
+            t1, t2 = time(9, 0), time(18, 0)
+        start = _at(base, t1)
+        end = _at(base, t2)
         return {"mode": "day_window", "start": start, "end": end, "duration_min": duration}
 
     return None
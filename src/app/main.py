@@ -2,6 +2,7 @@
 from .core.config import settings
 from .core.logging import get_logger
 from .core.errors import install_exception_handlers
+from .core.http import aclose_client
 from .routers.query import router as query_router
 from .routers.debug import router as debug_router
 
@@ -24,8 +25,9 @@ install_exception_handlers(app)
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    log.info(f"service.startup env={settings.APP_ENV}")
+    log.info("service.startup env=%s", settings.APP_ENV)
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
+    await aclose_client()
     log.info("service.shutdown")
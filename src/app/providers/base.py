@@ -1,12 +1,39 @@
 from __future__ import annotations
-from abc import ABC, abstractmethod
-from typing import List
+import asyncio
+from itertools import chain
+from typing import List, Optional, Protocol
 from ..schemas.query import ContextItem
+from ..core.logging import get_logger
 
+log = get_logger(__name__)
 
-class Provider(ABC):
+
+class Provider(Protocol):
     name: str
 
-    @abstractmethod
     async def fetch(self, query: str, limit: int = 5) -> List[ContextItem]:
         ...
+
+
+async def fetch_many(
+    providers: List[Provider],
+    query: str,
+    limit: int,
+    *,
+    errors: Optional[List[BaseException]] = None,
+) -> List[ContextItem]:
+    """
+    Fan out to all providers concurrently; results keep the providers' order.
+    A provider that raises is logged, appended to `errors` if given, and
+    contributes nothing.
+    """
+    results = await asyncio.gather(
+        *(p.fetch(query, limit=limit) for p in providers),
+        return_exceptions=True,
+    )
+    for p, r in zip(providers, results):
+        if isinstance(r, BaseException):
+            log.warning("provider.fetch.failed provider=%s error=%r", type(p).__name__, r)
+            if errors is not None:
+                errors.append(r)
+    return list(chain.from_iterable(r for r in results if not isinstance(r, BaseException)))
@@ -1,20 +1,23 @@
 from __future__ import annotations
+import re
 from typing import List
 from datetime import datetime, timedelta
 from ..schemas.query import ContextItem
 
+_TOMORROW_RE = re.compile(r"\btomorrow\b", re.I)
+
 class CalendarProvider:
     name = "calendar"
 
     async def fetch(self, query: str, limit: int = 5) -> List[ContextItem]:
         # Heuristic demo event (kept for dev/test usage)
         now = datetime.now()
-        day = (now + timedelta(days=1)) if "tomorrow" in query.lower() else now
+        day = (now + timedelta(days=1)) if _TOMORROW_RE.search(query) else now
         start = day.replace(hour=10, minute=0, second=0, microsecond=0)
         end = start + timedelta(hours=1)
 
         items: List[ContextItem] = [
-            ContextItem(
+            ContextItem.model_construct(
                 source="calendar",
                 title="Project Sync",
                 snippet=f"{start.strftime('%Y-%m-%d %H:%M')} - {end.strftime('%H:%M')} (local time)",
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import re
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone, date as _date
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
 
-import httpx
-from icalendar import Calendar
-from dateutil.tz import tzlocal
+from icalendar import Calendar, Component, Event
 
 from ..core.config import settings
+from ..schemas.query import ContextItem
+from ..core.http import get_client
+from ..core.timeparse import get_tz
 
-LOCAL_TZ = tzlocal()
+# Events are normalized to the configured zone (a stdlib ZoneInfo), the same
+# one the availability engine works in; tzlocal() is only the fallback.
+LOCAL_TZ = get_tz(settings.DEFAULT_TZ)
+_UTC = timezone.utc
 
 
 def _to_dt(value: Any) -> datetime | None:
@@ -22,25 +30,19 @@ def _to_dt(value: Any) -> datetime | None:
         return None
 
     # VEVENT fields are often wrapped objects exposing .dt
-    raw = value
     if hasattr(value, "dt"):
         value = value.dt
 
     if isinstance(value, datetime):
         dt = value
+        # attach timezone if missing
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=_UTC)
+    elif isinstance(value, _date):
+        # date -> aware datetime at 00:00 UTC in one construction
+        dt = datetime(value.year, value.month, value.day, tzinfo=_UTC)
     else:
-        # date -> datetime at 00:00
-        try:
-            if isinstance(value, _date):
-                dt = datetime(value.year, value.month, value.day)
-            else:
-                return None
-        except Exception:
-            return None
-
-    # attach timezone if missing
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
+        return None
 
     # convert to local tz
     return dt.astimezone(LOCAL_TZ)
@@ -63,78 +65,217 @@ def _is_all_day(dt_prop: Any) -> bool:
     return False
 
 
+# Raw VEVENT blocks and their (unfolded) DTSTART/DTEND lines, matched on line starts.
+_VEVENT_RE = re.compile(rb"^BEGIN:VEVENT\r?\n.*?^END:VEVENT\r?$", re.M | re.S)
+_VTIMEZONE_RE = re.compile(rb"^BEGIN:VTIMEZONE\r?\n.*?^END:VTIMEZONE\r?$", re.M | re.S)
+_DT_LINE_RE = {
+    name: re.compile(rb"^" + name + rb"(?:;([^:\r\n]*))?:(\d{8})(?:T(\d{6})(Z)?)?\r?$", re.M)
+    for name in (b"DTSTART", b"DTEND")
+}
+
+
+def _cheap_dt(chunk: bytes, name: bytes) -> datetime | None:
+    """
+    Read DTSTART/DTEND straight from the raw VEVENT bytes with the same
+    semantics as _to_dt (date/floating -> UTC, TZID via zoneinfo).
+    Returns None whenever we can't be sure, so the caller parses fully.
+    """
+    m = _DT_LINE_RE[name].search(chunk)
+    if not m:
+        return None
+    params, ymd, hms, zulu = m.groups()
+    tz: Any = _UTC
+    if hms and not zulu and params:
+        for p in params.decode("ascii", "replace").split(";"):
+            key, _, val = p.partition("=")
+            if key.upper() == "TZID":
+                try:
+                    tz = ZoneInfo(val.strip('"'))
+                except Exception:
+                    return None
+    try:
+        dt = datetime.strptime((ymd + (hms or b"000000")).decode("ascii"), "%Y%m%d%H%M%S")
+    except ValueError:
+        return None
+    return dt.replace(tzinfo=tz).astimezone(LOCAL_TZ)
+
+
+def _register_vtimezones(ics_bytes: bytes) -> None:
+    """
+    VEVENT blocks are parsed on their own, so a TZID defined only by the
+    feed's VTIMEZONE would come back naive. Parsing the VTIMEZONE blocks once
+    registers them with icalendar's (process-wide) timezone cache first.
+    """
+    blocks = [b.rstrip(b"\r") for b in _VTIMEZONE_RE.findall(ics_bytes)]
+    if not blocks:
+        return
+    try:
+        Calendar.from_ical(b"BEGIN:VCALENDAR\r\n" + b"\r\n".join(blocks) + b"\r\nEND:VCALENDAR\r\n")
+    except Exception:
+        pass
+
+
+# (start, end, raw VEVENT) with times as UTC epoch seconds; end is None when
+# it can't be read without parsing.
+_IndexEntry = Tuple[int, Optional[int], bytes]
+_HORIZON_S = 30 * 86400
+
+
+def _index_vevents(ics_bytes: bytes) -> List[_IndexEntry]:
+    """
+    Split the feed on VEVENT boundaries and sort the raw blocks by DTSTART.
+    Only blocks whose dates can't be read cheaply are parsed here.
+    """
+    _register_vtimezones(ics_bytes)
+    entries: List[_IndexEntry] = []
+    for m in _VEVENT_RE.finditer(ics_bytes):
+        chunk = m.group(0)
+        start = _cheap_dt(chunk, b"DTSTART")
+        end = _cheap_dt(chunk, b"DTEND")
+        if start is None:
+            try:
+                comp = Event.from_ical(chunk)
+            except Exception:
+                continue
+            start = _to_dt(comp.get("DTSTART"))
+            if start is None:
+                continue
+            dtend_prop = comp.get("DTEND")
+            end = _to_dt(dtend_prop) if dtend_prop else None
+        entries.append((int(start.timestamp()), int(end.timestamp()) if end else None, chunk))
+    entries.sort(key=lambda e: e[0])
+    return entries
+
+
+def _event_item(comp: Component, now_ts: int, horizon_ts: int) -> ContextItem | None:
+    summary = comp.get("SUMMARY")
+    dtstart_prop = comp.get("DTSTART")
+    dtend_prop = comp.get("DTEND")
+
+    start = _to_dt(dtstart_prop)
+    end = _to_dt(dtend_prop) if dtend_prop else None
+    if not summary or not start:
+        return None
+    title = str(summary)
+
+    # All-day detection
+    all_day = _is_all_day(dtstart_prop)
+
+    # If all-day and no explicit DTEND, treat as one full day
+    if all_day and not end:
+        end = (start + timedelta(days=1)).replace(microsecond=0)
+
+    # Only upcoming-ish events
+    if end and int(end.timestamp()) < now_ts:
+        return None
+    if int(start.timestamp()) > horizon_ts:
+        return None
+
+    # plain int formatting; strftime goes through the slower locale-aware path
+    stop = end or start
+    snippet = (
+        f"{start.year:04d}-{start.month:02d}-{start.day:02d} {start.hour:02d}:{start.minute:02d} - "
+        f"{stop.hour:02d}:{stop.minute:02d} (local time)"
+    )
+
+    return ContextItem.model_construct(
+        source="calendar",
+        title=title,
+        snippet=snippet,
+        url=None,
+        metadata={
+            "start": start.replace(microsecond=0).isoformat(),
+            "end": (end or start).replace(microsecond=0).isoformat(),
+            "all_day": bool(all_day),
+            "title": title,
+        },
+    )
+
+
+def _items_from_index(entries: List[_IndexEntry], limit: int) -> List[ContextItem]:
+    """
+    First `limit` upcoming events (next 30 days), sorted by start. `entries`
+    is start-ordered, so items come out sorted and we stop at the horizon or
+    once `limit` items are in.
+    """
+    if limit <= 0:
+        return []
+    now_ts = int(time.time())
+    horizon_ts = now_ts + _HORIZON_S
+
+    items: List[ContextItem] = []
+    for start_ts, end_ts, chunk in entries:
+        if start_ts > horizon_ts:
+            break
+        if end_ts is not None and end_ts < now_ts:
+            continue
+        try:
+            comp = Event.from_ical(chunk)
+        except Exception:
+            continue
+        item = _event_item(comp, now_ts, horizon_ts)
+        if item is None:
+            continue
+        items.append(item)
+        if len(items) >= limit:
+            break
+
+    return items
+
+
+@dataclass
+class _FeedCache:
+    etag: str | None
+    last_modified: str | None
+    index: List[_IndexEntry]
+    fetched_at: float
+
+
+# Per-URL feed cache: within _FEED_TTL_S we skip HTTP entirely; after that we
+# revalidate with If-None-Match / If-Modified-Since and reuse the index on 304.
+_FEED_TTL_S = 60.0
+_FEEDS: Dict[str, _FeedCache] = {}
+
+
 class CalendarICSProvider:
     """
     Pulls upcoming events from a Google Calendar ICS URL and emits context items.
     """
 
+    name = "calendar"
+
     def __init__(self, timeout_s: float = 10.0) -> None:
         if not settings.CALENDAR_ICS_URL:
             raise RuntimeError("CALENDAR_ICS_URL is not set")
         self.url = settings.CALENDAR_ICS_URL
         self.timeout_s = timeout_s
 
-    async def fetch(self, query: str, *, limit: int = 10) -> List[Dict[str, Any]]:
+    async def fetch(self, query: str, limit: int = 10) -> List[ContextItem]:
         """
         Return upcoming events (next 30 days) as context items.
         """
-        async with httpx.AsyncClient(timeout=self.timeout_s) as client:
-            resp = await client.get(self.url)
-            resp.raise_for_status()
-            ics_bytes = resp.content
-
-        cal = Calendar.from_ical(ics_bytes)
-        now = datetime.now(LOCAL_TZ)
-        horizon = now + timedelta(days=30)
-
-        items: List[Dict[str, Any]] = []
-        for comp in cal.walk("VEVENT"):
-            summary = comp.get("SUMMARY")
-            dtstart_prop = comp.get("DTSTART")
-            dtend_prop = comp.get("DTEND")
+        cached = _FEEDS.get(self.url)
+        if cached and time.monotonic() - cached.fetched_at < _FEED_TTL_S:
+            return _items_from_index(cached.index, limit)
 
-            start = _to_dt(dtstart_prop)
-            end = _to_dt(dtend_prop) if dtend_prop else None
-            if not summary or not start:
-                continue
-
-            # All-day detection
-            all_day = _is_all_day(dtstart_prop)
-
-            # If all-day and no explicit DTEND, treat as one full day
-            if all_day and not end:
-                end = (start + timedelta(days=1)).replace(microsecond=0)
+        headers: Dict[str, str] = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
 
-            # Only upcoming-ish events
-            if end and end < now:
-                continue
-            if start > horizon:
-                continue
-
-            # Optional light filter on summary (no-op for now)
-            if query and query.strip():
-                _ = query  # placeholder for future scoring
-
-            snippet = (
-                f"{start.strftime('%Y-%m-%d %H:%M')} - "
-                f"{(end or start).strftime('%H:%M')} (local time)"
-            )
-
-            items.append(
-                {
-                    "source": "calendar",
-                    "title": str(summary),
-                    "snippet": snippet,
-                    "url": None,
-                    "metadata": {
-                        "start": start.replace(microsecond=0).isoformat(),
-                        "end": (end or start).replace(microsecond=0).isoformat(),
-                        "all_day": bool(all_day),
-                        "title": str(summary),
-                    },
-                }
-            )
-
-        # sort and cap
-        items.sort(key=lambda x: x["metadata"]["start"])
-        return items[:limit]
+        resp = await get_client().get(self.url, headers=headers, timeout=self.timeout_s)
+        if cached and resp.status_code == 304:
+            # Unchanged feed: the sorted index doesn't depend on "now", reuse it.
+            index = cached.index
+        else:
+            resp.raise_for_status()
+            # splitting/sorting a large feed is CPU-bound: keep it off the event loop
+            index = await asyncio.to_thread(_index_vevents, resp.content)
+        _FEEDS[self.url] = _FeedCache(
+            etag=resp.headers.get("etag") or (cached.etag if cached else None),
+            last_modified=resp.headers.get("last-modified") or (cached.last_modified if cached else None),
+            index=index,
+            fetched_at=time.monotonic(),
+        )
+        return _items_from_index(index, limit)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from typing import List
-import httpx
+import orjson
 from ..schemas.query import ContextItem
 from ..core.config import settings
+from ..core.http import get_client
 from ..core.logging import get_logger
 
 log = get_logger(__name__)
@@ -12,11 +13,17 @@ GITHUB_SEARCH = "https://api.github.com/search/issues"
 class GitHubProvider:
     name = "github"
 
+    def __init__(self) -> None:
+        self._token = settings.GITHUB_TOKEN
+        self._headers = {
+            "Authorization": f"Bearer {self._token}",
+            "Accept": "application/vnd.github+json",
+        }
+
     async def fetch(self, query: str, limit: int = 5) -> List[ContextItem]:
-        token = settings.GITHUB_TOKEN
-        if not token:
+        if not self._token:
             return [
-                ContextItem(
+                ContextItem.model_construct(
                     source="github",
                     title="(github) token not configured",
                     snippet="Set GITHUB_TOKEN in .env to enable live search.",
@@ -37,20 +44,15 @@ class GitHubProvider:
             "order": "desc",
             "per_page": str(min(limit, 5)),
         }
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-        }
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(GITHUB_SEARCH, headers=headers, params=params)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await get_client().get(GITHUB_SEARCH, headers=self._headers, params=params)
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
         except Exception as e:
             log.warning("github.fetch.failed error=%r", e)
             return [
-                ContextItem(
+                ContextItem.model_construct(
                     source="github",
                     title="(github) fetch error",
                     snippet=str(e),
@@ -69,7 +71,7 @@ class GitHubProvider:
             who = (n.get("user") or {}).get("login")
             snippet = f"{'PR' if is_pr else 'Issue'} • {state} • by {who}"
             items.append(
-                ContextItem(
+                ContextItem.model_construct(
                     source="github",
                     title=title,
                     snippet=snippet,
@@ -87,7 +89,7 @@ class GitHubProvider:
 
         if not items:
             items.append(
-                ContextItem(
+                ContextItem.model_construct(
                     source="github",
                     title="(github) no results",
                     snippet="No open issues/PRs matched.",
@@ -1,8 +1,11 @@
 from __future__ import annotations
-from typing import List, Any, Dict, Optional
-import httpx
+import time
+from collections import OrderedDict
+from typing import List, Any, Dict, Optional, Tuple
+import orjson
 from ..schemas.query import ContextItem
 from ..core.config import settings
+from ..core.http import get_client
 from ..core.logging import get_logger
 
 log = get_logger(__name__)
@@ -10,34 +13,68 @@ log = get_logger(__name__)
 NOTION_API = "https://api.notion.com/v1/search"
 NOTION_VERSION = "2022-06-28"  # stable, works fine for simple search
 
+# /search is slow and rate-limited, so repeat queries are served from a small
+# per-provider LRU for a short while. Notion sends no ETag on search, so there
+# is nothing to revalidate with; entries simply expire.
+_CACHE_TTL_S = 30.0
+_CACHE_MAX = 64
 
-def _first_title_from_properties(props: Dict[str, Any]) -> Optional[str]:
-    # Try common title-ish fields
+
+def _title_text(prop: Dict[str, Any]) -> Optional[str]:
+    arr = prop.get("title") or []
+    if arr and isinstance(arr, list) and "plain_text" in arr[0]:
+        return arr[0]["plain_text"] or None
+    return None
+
+
+def _title_key(props: Dict[str, Any]) -> Optional[str]:
+    # Notion allows exactly one title property per page/database.
     # Priority: 'Name' (common in DBs), then any property with type 'title'
-    if not isinstance(props, dict):
-        return None
-    if "Name" in props and props["Name"].get("type") == "title":
-        arr = props["Name"].get("title") or []
-        if arr and isinstance(arr, list) and "plain_text" in arr[0]:
-            return arr[0]["plain_text"] or None
-    # Fallback: find first title property
+    name = props.get("Name")
+    if isinstance(name, dict) and name.get("type") == "title":
+        return "Name"
     for k, v in props.items():
         if isinstance(v, dict) and v.get("type") == "title":
-            arr = v.get("title") or []
-            if arr and isinstance(arr, list) and "plain_text" in arr[0]:
-                return arr[0]["plain_text"] or None
+            return k
     return None
 
 
 class NotionProvider:
     name = "notion"
 
+    def __init__(self) -> None:
+        self._token = settings.NOTION_TOKEN
+        self._headers = {
+            "Authorization": f"Bearer {self._token}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json",
+        }
+        # database_id -> name of its title property; stable within a database
+        self._title_keys: Dict[str, str] = {}
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[float, List[ContextItem]]]" = OrderedDict()
+
+    def _page_title(self, r: Dict[str, Any], props: Dict[str, Any]) -> Optional[str]:
+        if not isinstance(props, dict):
+            return None
+        parent = r.get("parent")
+        db_id = parent.get("database_id") if isinstance(parent, dict) else None
+        cached_key = self._title_keys.get(db_id) if db_id else None
+        if cached_key is not None:
+            prop = props.get(cached_key)
+            if isinstance(prop, dict) and prop.get("type") == "title":
+                return _title_text(prop)
+        key = _title_key(props)
+        if key is None:
+            return None
+        if db_id:
+            self._title_keys[db_id] = key
+        return _title_text(props[key])
+
     async def fetch(self, query: str, limit: int = 5) -> List[ContextItem]:
-        token = settings.NOTION_TOKEN
-        if not token:
+        if not self._token:
             # Graceful stub when token not present
             return [
-                ContextItem(
+                ContextItem.model_construct(
                     source="notion",
                     title="(notion) token not configured",
                     snippet="Set NOTION_TOKEN in .env to enable live search.",
@@ -46,26 +83,27 @@ class NotionProvider:
                 )
             ][: min(limit, 1)]
 
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Notion-Version": NOTION_VERSION,
-            "Content-Type": "application/json",
-        }
+        key = (query or "", limit)
+        hit = self._cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < _CACHE_TTL_S:
+            self._cache.move_to_end(key)
+            return list(hit[1])
+
         body = {
             "query": query or "",  # Notion requires a string
             "sort": {"direction": "descending", "timestamp": "last_edited_time"},
+            "page_size": max(1, min(limit, 100)),  # Notion defaults to 100; we only keep `limit`
             # We don’t require a filter here; this returns pages and databases.
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.post(NOTION_API, headers=headers, json=body)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await get_client().post(NOTION_API, headers=self._headers, json=body)
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
         except Exception as e:
             log.warning("notion.fetch.failed error=%r", e)
             return [
-                ContextItem(
+                ContextItem.model_construct(
                     source="notion",
                     title="(notion) fetch error",
                     snippet=str(e),
@@ -81,10 +119,10 @@ class NotionProvider:
                 continue
             url = r.get("url")
             props = r.get("properties", {}) if r.get("object") == "page" else {}
-            title = _first_title_from_properties(props) or r.get("title") or "Notion item"
+            title = self._page_title(r, props) or r.get("title") or "Notion item"
             snippet = "Notion page" if r.get("object") == "page" else "Notion database"
             items.append(
-                ContextItem(
+                ContextItem.model_construct(
                     source="notion",
                     title=str(title),
                     snippet=snippet,
@@ -100,7 +138,7 @@ class NotionProvider:
 
         if not items:
             items.append(
-                ContextItem(
+                ContextItem.model_construct(
                     source="notion",
                     title="(notion) no results",
                     snippet="No matching pages/databases.",
@@ -108,4 +146,9 @@ class NotionProvider:
                     metadata={"query": query},
                 )
             )
-        return items
+
+        self._cache[key] = (time.monotonic(), items)
+        self._cache.move_to_end(key)
+        if len(self._cache) > _CACHE_MAX:
+            self._cache.popitem(last=False)
+        return list(items)
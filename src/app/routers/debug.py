@@ -1,15 +1,30 @@
 from __future__ import annotations
+import asyncio
+from dataclasses import dataclass
+from typing import Dict
 from fastapi import APIRouter, Query
 from ..core.config import settings
+from ..core.http import get_client
 from ..providers.calendar_ics import CalendarICSProvider
 from ..providers.calendar import CalendarProvider
 from ..providers.notion import NotionProvider
 from ..providers.github import GitHubProvider
-import httpx
 from icalendar import Calendar
 
 router = APIRouter()  # prefix applied in main.py
 
+
+@dataclass
+class _DiagCache:
+    etag: str | None
+    last_modified: str | None
+    first_300_chars: str | None
+    cal: Calendar
+
+
+# Last parsed feed per URL, so a 304 on revalidation skips download and parse.
+_DIAG: Dict[str, _DiagCache] = {}
+
 def _calendar_provider():
     return CalendarICSProvider() if settings.CALENDAR_ICS_URL else CalendarProvider()
 
@@ -45,33 +60,60 @@ async def calendar_diag():
     if not settings.CALENDAR_ICS_URL:
         return {"ok": False, "why": "CALENDAR_ICS_URL is not set in .env"}
 
+    url = settings.CALENDAR_ICS_URL
+    cached = _DIAG.get(url)
+    headers: Dict[str, str] = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+
     # 1) Fetch
     try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            resp = await client.get(settings.CALENDAR_ICS_URL)
+        resp = await get_client().get(url, headers=headers, follow_redirects=True, timeout=15.0)
+        not_modified = cached is not None and resp.status_code == 304
+        if not_modified:
+            first_300 = cached.first_300_chars
+        else:
+            first_300 = resp.text[:300] if resp.text else None
         fetch = {
-            "ok": resp.is_success,
+            "ok": resp.is_success or not_modified,
             "status": resp.status_code,
+            "not_modified": not_modified,
             "url": str(resp.url),
             "headers_sample": {k: resp.headers.get(k) for k in ["content-type", "content-length", "etag", "last-modified"]},
-            "first_300_chars": resp.text[:300] if resp.text else None,
+            "first_300_chars": first_300,
         }
     except Exception as e:
         return {"ok": False, "stage": "fetch", "error": str(e)}
 
     # 2) Parse
     try:
-        cal = Calendar.from_ical(resp.content)
-        vevents = [c for c in cal.walk("VEVENT")]
-        # peek at first event fields
+        if not_modified:
+            cal = cached.cal
+        else:
+            cal = await asyncio.to_thread(Calendar.from_ical, resp.content)
+            etag = resp.headers.get("etag")
+            last_modified = resp.headers.get("last-modified")
+            if resp.is_success and (etag or last_modified):
+                _DIAG[url] = _DiagCache(etag, last_modified, first_300, cal)
+        # VEVENTs are direct children of VCALENDAR; walk() would also descend into
+        # every VALARM and build a list we only need the length and head of.
+        events_found = 0
+        first = None
+        for comp in cal.subcomponents:
+            if comp.name != "VEVENT":
+                continue
+            if first is None:
+                first = comp
+            events_found += 1
         peek = None
-        if vevents:
-            comp = vevents[0]
+        if first is not None:
             peek = {
-                "SUMMARY": str(comp.get("SUMMARY")),
-                "DTSTART_raw": str(comp.get("DTSTART")),
-                "DTEND_raw": str(comp.get("DTEND")),
+                "SUMMARY": str(first.get("SUMMARY")),
+                "DTSTART_raw": str(first.get("DTSTART")),
+                "DTEND_raw": str(first.get("DTEND")),
             }
-        return {"ok": True, "stage": "parse", "events_found": len(vevents), "fetch": fetch, "peek": peek}
+        return {"ok": True, "stage": "parse", "events_found": events_found, "fetch": fetch, "peek": peek}
     except Exception as e:
         return {"ok": False, "stage": "parse", "error": str(e), "fetch": fetch}
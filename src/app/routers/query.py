@@ -1,6 +1,10 @@
 from __future__ import annotations
-from typing import List, Any
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Any, Tuple
 from fastapi import APIRouter
+from pydantic import TypeAdapter, ValidationError
 from ..schemas.query import QueryRequest, QueryResponse, ContextItem
 from ..core.intent import classify_intent
 from ..core.summarize import summarize
@@ -9,6 +13,7 @@ from ..providers.notion import NotionProvider
 from ..providers.github import GitHubProvider
 from ..providers.calendar import CalendarProvider
 from ..providers.calendar_ics import CalendarICSProvider
+from ..providers.base import Provider, fetch_many
 from ..core.logging import get_logger
 
 from ..core.availability import decide_availability, events_from_context_items
@@ -16,35 +21,80 @@ from ..core.availability import decide_availability, events_from_context_items
 log = get_logger(__name__)
 router = APIRouter(tags=["query"])
 
-calendar_provider = CalendarICSProvider() if settings.CALENDAR_ICS_URL else CalendarProvider()
-log.info(f"calendar.provider.selected provider={type(calendar_provider).__name__}")
+PROVIDER_NAMES = ("calendar", "notion", "github")
+_KNOWN_SOURCES = frozenset(PROVIDER_NAMES)
+_ITEMS_ADAPTER = TypeAdapter(List[ContextItem])
 
-PROVIDERS = {
-    "calendar": calendar_provider,
-    "notion": NotionProvider(),
-    "github": GitHubProvider(),
+
+@lru_cache(maxsize=None)
+def _provider(name: str) -> Provider:
+    """Built on first use: import stays cheap and a misconfigured source only fails itself."""
+    if name == "calendar":
+        provider: Provider = CalendarICSProvider() if settings.CALENDAR_ICS_URL else CalendarProvider()
+        log.info("calendar.provider.selected provider=%s", type(provider).__name__)
+        return provider
+    if name == "notion":
+        return NotionProvider()
+    if name == "github":
+        return GitHubProvider()
+    raise ValueError(f"unknown provider {name!r}")
+
+# Exact-match response cache keyed on the lower-cased query.
+# Anything that includes calendar data depends on "now", so it expires as soon
+# as the ICS feed cache does; the rest lives longer. Entries hold their expiry.
+_RESPONSE_TTL_CALENDAR_S = 60.0
+_RESPONSE_TTL_DEFAULT_S = 600.0
+_RESPONSE_CACHE_MAX = 128
+_RESPONSES: "OrderedDict[Tuple[str, Tuple[str, ...], int], Tuple[float, QueryResponse]]" = OrderedDict()
+
+
+def _cache_key(payload: QueryRequest) -> Tuple[str, Tuple[str, ...], int]:
+    # Key on the text exactly as classify_intent and timeparse see it (they only
+    # lower-case): their keywords contain spaces, so collapsing whitespace here
+    # could hand one query another query's intent.
+    return (payload.query.lower(), tuple(payload.sources), payload.max_tokens)
+
+
+def _cached_response(key: Tuple[str, Tuple[str, ...], int]) -> QueryResponse | None:
+    hit = _RESPONSES.get(key)
+    if hit is None:
+        return None
+    if time.monotonic() >= hit[0]:
+        del _RESPONSES[key]
+        return None
+    _RESPONSES.move_to_end(key)
+    return hit[1]
+
+
+def _store_response(key: Tuple[str, Tuple[str, ...], int], resp: QueryResponse, ttl_s: float) -> None:
+    _RESPONSES[key] = (time.monotonic() + ttl_s, resp)
+    _RESPONSES.move_to_end(key)
+    if len(_RESPONSES) > _RESPONSE_CACHE_MAX:
+        _RESPONSES.popitem(last=False)
+
+
+# Source priority per intent for "all"; intents map onto the provider that serves them.
+_INTENT_ORDER = {
+    "calendar": ("calendar", "notion", "github"),
+    "code": ("github", "notion", "calendar"),
+    "notes": ("notion", "github", "calendar"),
+    "general": ("calendar", "notion", "github"),
 }
 
-def _select_sources(requested: List[str], intent: str) -> List[str]:
-    if "all" in requested:
-        order = [intent] + [s for s in ["calendar", "notion", "github"] if s != intent]
-        return [s for s in order if s in PROVIDERS]
-    return [s for s in requested if s in PROVIDERS]
 
-@router.post("/query", response_model=QueryResponse)
-async def handle_query(payload: QueryRequest) -> QueryResponse:
-    intent = classify_intent(payload.query)
-    selected = _select_sources(payload.sources, intent)
+def _is_placeholder(it: ContextItem) -> bool:
+    # Providers flag errors, missing tokens and empty results as "(<source>) ..." items.
+    return it.title.startswith(f"({it.source}) ")
 
-    raw_items: List[Any] = []
-    for name in selected:
-        provider = PROVIDERS.get(name)
-        if not provider:
-            continue
-        items = await provider.fetch(payload.query, limit=5)
-        raw_items.extend(items)
 
-    # Normalize to ContextItem
+@lru_cache(maxsize=64)
+def _select_sources(requested: Tuple[str, ...], intent: str) -> Tuple[str, ...]:
+    if "all" in requested:
+        return _INTENT_ORDER.get(intent, _INTENT_ORDER["general"])
+    return tuple(s for s in requested if s in _KNOWN_SOURCES)
+
+def _normalize_each(raw_items: List[Any]) -> List[ContextItem]:
+    """Item-by-item fallback: keeps whatever validates and logs the rest."""
     gathered: List[ContextItem] = []
     for it in raw_items:
         if isinstance(it, ContextItem):
@@ -53,7 +103,7 @@ async def handle_query(payload: QueryRequest) -> QueryResponse:
             try:
                 gathered.append(ContextItem(**it))
             except Exception as e:
-                log.warning(f"normalize.context_item.failed error={e!r} it={it}")
+                log.warning("normalize.context_item.failed error=%r it=%s", e, it)
         else:
             try:
                 gathered.append(
@@ -66,7 +116,48 @@ async def handle_query(payload: QueryRequest) -> QueryResponse:
                     )
                 )
             except Exception as e:
-                log.warning(f"normalize.context_item.unknown_type error={e!r} type={type(it)}")
+                log.warning("normalize.context_item.unknown_type error=%r type=%s", e, type(it))
+    return gathered
+
+
+@router.post("/query", response_model=QueryResponse)
+async def handle_query(payload: QueryRequest) -> QueryResponse:
+    intent = classify_intent(payload.query)
+    key = _cache_key(payload)
+    if not payload.no_cache:
+        cached = _cached_response(key)
+        if cached is not None:
+            return cached
+
+    selected = _select_sources(tuple(payload.sources), intent)
+    # Degraded answers (a provider that failed to build or fetch, or handed
+    # back an error/stub item) are served but never cached.
+    degraded = False
+
+    providers: List[Provider] = []
+    for name in selected:
+        try:
+            providers.append(_provider(name))
+        except (RuntimeError, ValueError) as e:
+            log.warning("provider.init.failed provider=%s error=%r", name, e)
+            degraded = True
+
+    # Providers are independent network calls: overlap them instead of awaiting each in turn.
+    errors: List[BaseException] = []
+    raw_items: List[Any] = await fetch_many(providers, payload.query, limit=5, errors=errors)
+    degraded = degraded or bool(errors)
+
+    # Normalize to ContextItem. Built-in providers already return models, so
+    # usually there is nothing to do; otherwise one compiled validation pass
+    # for the whole batch, falling back per item if anything is off.
+    gathered: List[ContextItem]
+    if all(isinstance(it, ContextItem) for it in raw_items):
+        gathered = raw_items
+    else:
+        try:
+            gathered = _ITEMS_ADAPTER.validate_python(raw_items, from_attributes=True)
+        except ValidationError:
+            gathered = _normalize_each(raw_items)
 
     pkg = summarize(gathered, payload.max_tokens)
 
@@ -75,18 +166,21 @@ async def handle_query(payload: QueryRequest) -> QueryResponse:
     explanation = None
     suggested_slots = None
 
-    try:
-        cal_events = events_from_context_items(gathered)
-        result = decide_availability(query_text=payload.query, events=cal_events, cfg=settings)
-        availability = result.availability
-        conflicts = result.conflicts or None
-        explanation = result.explanation or None
-        suggested_slots = result.suggested_slots or None
-    except Exception as e:
-        log.warning(f"availability.compute.failed error={e!r}")
+    # Availability only means something for calendar questions; skip it otherwise.
+    if intent == "calendar":
+        try:
+            cal_events = list(events_from_context_items(gathered))
+            result = decide_availability(query_text=payload.query, events=cal_events, cfg=settings)
+            availability = result.availability
+            conflicts = result.conflicts or None
+            explanation = result.explanation or None
+            suggested_slots = result.suggested_slots or None
+        except Exception as e:
+            log.warning("availability.compute.failed error=%r", e)
+            degraded = True
 
 
-    return QueryResponse(
+    resp = QueryResponse(
         intent=intent,
         context_items=gathered,
         context_package=pkg,
@@ -95,3 +189,7 @@ async def handle_query(payload: QueryRequest) -> QueryResponse:
         explanation=explanation,
         suggested_slots=suggested_slots,
     )
+    if not degraded and not any(_is_placeholder(it) for it in gathered):
+        ttl_s = _RESPONSE_TTL_CALENDAR_S if "calendar" in selected else _RESPONSE_TTL_DEFAULT_S
+        _store_response(key, resp, ttl_s)
+    return resp
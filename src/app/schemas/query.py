@@ -1,23 +1,28 @@
 from __future__ import annotations
-from typing import Any, Literal, List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Literal, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 SourceName = Literal["calendar", "notion", "github", "all"]
 
 class QueryRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     query: str = Field(..., description="User's natural language query")
     sources: List[SourceName] = Field(
         default_factory=lambda: ["all"],
         description='Preferred sources: "calendar" | "notion" | "github" | "all"',
     )
     max_tokens: int = Field(512, ge=64, le=4096)
+    no_cache: bool = Field(False, description="Bypass the response cache and refetch from providers")
 
 class ContextItem(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     source: SourceName
     title: str
     snippet: str
     url: Optional[str] = None
-    metadata: dict[str, Any] | None = None
+    metadata: Optional[Dict[str, Any]] = None
 
 class ContextPackage(BaseModel):
     tokens: int
@@ -30,6 +35,8 @@ class SuggestedSlot(BaseModel):
     reason: Optional[str] = None
 
 class QueryResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     intent: Literal["calendar", "code", "notes", "general"]
     context_items: List[ContextItem]
     context_package: ContextPackage
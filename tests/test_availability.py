@@ -10,7 +10,7 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from app.core.availability import decide_availability  # type: ignore
+from app.core.availability import decide_availability, events_from_context_items  # type: ignore
 from app.core.timeparse import parse_query_to_windows  # type: ignore
 
 class DummyCfg:
@@ -67,3 +67,83 @@ def test_all_day_blocks_daypart():
     events = [_event("OOO", t_start, t_end, all_day=True)]
     res = decide_availability("tomorrow afternoon", events, DummyCfg)
     assert res.availability == "busy"
+
+def test_long_event_overlapping_window_start_is_reported():
+    # Sorted-by-start scan must still catch a long block that began before the window
+    events = [
+        _event("Offsite", _tomorrow_at(8, 0), _tomorrow_at(13, 0)),
+        _event("Coffee", _tomorrow_at(9, 0), _tomorrow_at(9, 30)),
+        _event("Dinner", _tomorrow_at(18, 0), _tomorrow_at(19, 0)),
+    ]
+    res = decide_availability("tomorrow afternoon", events, DummyCfg)
+    assert res.availability == "busy"
+    assert [c["title"] for c in res.conflicts] == ["Offsite"]
+
+def test_merging_for_slots_does_not_stretch_reported_conflicts():
+    events = [
+        _event("A", _tomorrow_at(10, 0), _tomorrow_at(11, 0)),
+        _event("B", _tomorrow_at(10, 30), _tomorrow_at(12, 0)),
+    ]
+    res = decide_availability("am I free tomorrow at 11:30?", events, DummyCfg)
+    assert res.availability == "busy"
+    assert [c["title"] for c in res.conflicts] == ["B"]
+
+
+def test_events_from_context_items_handles_dicts_and_objects():
+    class Item:
+        source = "calendar"
+        title = "Obj"
+        metadata = {"start": "2030-01-01T10:00:00-06:00", "end": "2030-01-01T11:00:00-06:00"}
+
+    items = [
+        {"source": "notion", "title": "skip", "metadata": {"start": "x", "end": "y"}},
+        {"source": "calendar", "title": "Dict", "metadata": {"start": "a", "end": "b", "all_day": 1}},
+        {"source": "calendar", "title": "no times", "metadata": {}},
+        Item(),
+    ]
+    events = list(events_from_context_items(items))
+    assert [e["title"] for e in events] == ["Dict", "Obj"]
+    assert events[0]["all_day"] is True
+
+def test_edge_policy_reload_picks_up_env_override(monkeypatch):
+    from app.core import availability  # type: ignore
+    from app.core.config import get_settings  # type: ignore
+
+    events = [_event("Late sync", _tomorrow_at(17, 0), _tomorrow_at(18, 0))]
+    assert decide_availability("tomorrow afternoon", events, DummyCfg).availability == "free"
+
+    monkeypatch.setenv("AVAILABILITY_EDGE_POLICY", "inclusive")
+    get_settings.cache_clear()
+    availability.reload_edge_policy()
+    try:
+        assert decide_availability("tomorrow afternoon", events, DummyCfg).availability == "busy"
+    finally:
+        monkeypatch.delenv("AVAILABILITY_EDGE_POLICY")
+        get_settings.cache_clear()
+        availability.reload_edge_policy()
+
+def test_malformed_events_are_skipped():
+    s = _tomorrow_at(10, 0)
+    e = _tomorrow_at(11, 0)
+    events = [
+        {"title": "no end", "start": _iso(s)},
+        {"title": "garbage", "start": "not-a-date", "end": _iso(e)},
+        {"title": "wrong type", "start": 123, "end": _iso(e)},
+        _event("Project Sync", s, e),
+    ]
+    res = decide_availability("am I free tomorrow at 10?", events, DummyCfg)
+    assert [c["title"] for c in res.conflicts] == ["Project Sync"]
+
+def test_suggested_slot_keeps_seconds_of_busy_block_end():
+    s = _tomorrow_at(12, 0)
+    e = _tomorrow_at(12, 10) + timedelta(seconds=30)
+    res = decide_availability("book 30 min after 12 tomorrow", [_event("Review", s, e)], DummyCfg)
+    first = res.suggested_slots[0]
+    assert datetime.fromisoformat(first["start"]) == e
+    assert datetime.fromisoformat(first["end"]) == e + timedelta(minutes=30)
+
+def test_zero_length_request_does_not_suggest_slot_at_window_end():
+    s = _tomorrow_at(9, 0)
+    e = _tomorrow_at(18, 0)
+    res = decide_availability("book 0 min after 9 tomorrow", [_event("Offsite", s, e)], DummyCfg)
+    assert not res.suggested_slots
@@ -0,0 +1,131 @@
+from __future__ import annotations
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from src.app.core import http
+from src.app.core.config import settings
+from src.app.providers import calendar_ics
+from src.app.providers.calendar_ics import CalendarICSProvider
+
+
+def _stamp(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _feed(now: datetime) -> bytes:
+    def ev(summary: str, *props: str) -> list[str]:
+        return ["BEGIN:VEVENT", f"SUMMARY:{summary}", *props, "END:VEVENT"]
+
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+    lines += ev("past", f"DTSTART:{_stamp(now - timedelta(days=2))}", f"DTEND:{_stamp(now - timedelta(days=2, hours=-1))}")
+    lines += ev("ongoing", f"DTSTART:{_stamp(now - timedelta(hours=1))}", f"DTEND:{_stamp(now + timedelta(hours=1))}")
+    lines += ev(
+        "tzid",
+        "DTSTART;TZID=America/New_York:" + (now + timedelta(days=1)).astimezone(timezone.utc).strftime("%Y%m%dT%H%M%S"),
+        "BEGIN:VALARM", "TRIGGER:-PT10M", "ACTION:DISPLAY", "END:VALARM",
+    )
+    lines += ev("all day", "DTSTART;VALUE=DATE:" + (now + timedelta(days=3)).strftime("%Y%m%d"))
+    lines += ev("too far", f"DTSTART:{_stamp(now + timedelta(days=45))}", f"DTEND:{_stamp(now + timedelta(days=45, hours=1))}")
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def _install(monkeypatch, handler) -> None:
+    monkeypatch.setattr(settings, "CALENDAR_ICS_URL", "https://calendar.test/basic.ics")
+    monkeypatch.setattr(calendar_ics, "_FEEDS", {})
+    monkeypatch.setattr(http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def _run_fetch(monkeypatch, body: bytes, limit: int = 10):
+    _install(monkeypatch, lambda req: httpx.Response(200, content=body))
+    return asyncio.run(CalendarICSProvider().fetch("debug", limit=limit))
+
+
+def test_fetch_keeps_only_upcoming_window(monkeypatch):
+    items = _run_fetch(monkeypatch, _feed(datetime.now(timezone.utc)))
+    titles = [it.title for it in items]
+    assert titles == ["ongoing", "tzid", "all day"]
+    all_day = items[-1].metadata
+    assert all_day["all_day"] is True
+    assert datetime.fromisoformat(all_day["end"]) - datetime.fromisoformat(all_day["start"]) == timedelta(days=1)
+
+
+def test_fetch_limit_takes_earliest_regardless_of_feed_order(monkeypatch):
+    now = datetime.now(timezone.utc)
+    body = _feed(now).replace(
+        b"END:VCALENDAR",
+        (
+            "BEGIN:VEVENT\r\nSUMMARY:soon\r\n"
+            f"DTSTART:{_stamp(now + timedelta(minutes=30))}\r\n"
+            "END:VEVENT\r\nEND:VCALENDAR"
+        ).encode(),
+    )
+    items = _run_fetch(monkeypatch, body, limit=2)
+    assert [it.title for it in items] == ["ongoing", "soon"]
+
+
+def test_fetch_resolves_tzid_defined_only_by_feed_vtimezone(monkeypatch):
+    tzid = "(UTC-05:00) Custom Test Time"
+    day = (datetime.now(timezone.utc) + timedelta(days=2)).strftime("%Y%m%d")
+    body = "\r\n".join([
+        "BEGIN:VCALENDAR", "VERSION:2.0",
+        "BEGIN:VTIMEZONE", f"TZID:{tzid}",
+        "BEGIN:STANDARD", "DTSTART:16010101T000000", "TZOFFSETFROM:-0500", "TZOFFSETTO:-0500", "END:STANDARD",
+        "END:VTIMEZONE",
+        "BEGIN:VEVENT", "SUMMARY:custom tz",
+        f'DTSTART;TZID="{tzid}":{day}T100000', f'DTEND;TZID="{tzid}":{day}T110000',
+        "END:VEVENT",
+        "END:VCALENDAR", "",
+    ]).encode()
+    items = _run_fetch(monkeypatch, body)
+    assert [it.title for it in items] == ["custom tz"]
+    expected = datetime.strptime(day + "1500", "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+    assert datetime.fromisoformat(items[0].metadata["start"]) == expected
+    assert datetime.fromisoformat(items[0].metadata["end"]) == expected + timedelta(hours=1)
+
+
+def test_fetch_revalidates_with_etag_and_reuses_body_on_304(monkeypatch):
+    body = _feed(datetime.now(timezone.utc))
+    seen: list[str | None] = []
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        seen.append(req.headers.get("if-none-match"))
+        if req.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={"ETag": '"v1"'})
+
+    _install(monkeypatch, handler)
+    provider = CalendarICSProvider()
+    first = asyncio.run(provider.fetch("debug"))
+    asyncio.run(provider.fetch("debug"))  # within TTL: no request at all
+    assert seen == [None]
+
+    monkeypatch.setattr(calendar_ics, "_FEED_TTL_S", 0.0)
+    again = asyncio.run(provider.fetch("debug"))
+    assert seen == [None, '"v1"']
+    assert [it.title for it in again] == [it.title for it in first]
+
+
+def test_calendar_diag_reuses_parsed_feed_on_304(monkeypatch):
+    from fastapi.testclient import TestClient
+    from src.app.main import app
+    from src.app.routers import debug
+
+    body = _feed(datetime.now(timezone.utc))
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        if req.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={"ETag": '"v1"'})
+
+    _install(monkeypatch, handler)
+    monkeypatch.setattr(debug, "_DIAG", {})
+    client = TestClient(app)
+    first = client.get("/debug/calendar/diag").json()
+    again = client.get("/debug/calendar/diag").json()
+    assert first["fetch"]["not_modified"] is False
+    assert again["fetch"]["not_modified"] is True and again["ok"] is True
+    assert again["events_found"] == first["events_found"] == 5
+    assert again["peek"] == first["peek"]
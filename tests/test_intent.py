@@ -0,0 +1,39 @@
+from __future__ import annotations
+import itertools
+
+from src.app.core import nlp
+from src.app.core.intent import classify_intent
+
+
+def _naive_score(text: str, kws: set[str]) -> int:
+    return sum(k in text for k in kws)
+
+
+def test_classify_intent_categories():
+    assert classify_intent("am I free tomorrow at 10?") == "calendar"
+    assert classify_intent("summarize my Notion meeting notes") == "notes"
+    assert classify_intent("open issue about the login PR please") == "code"
+    assert classify_intent("") == "general"
+    assert classify_intent(None) == "general"
+
+
+def test_detect_intent_counts_match_substring_scan():
+    # nested / shared-prefix keywords are the tricky cases for a single alternation
+    samples = [
+        "meeting notes from the retro",
+        "issues with prod pipeline",
+        "pr for the cpu bug",
+        "status of deploy pull request",
+        "action items doc page wiki",
+        "free slot today or tomorrow",
+    ]
+    samples += [" ".join(p) for p in itertools.permutations(["issues", "prod", "meeting notes"], 3)]
+    for text in samples:
+        assert nlp._count_kws(text, nlp._CALENDAR_M) == _naive_score(text, nlp.CALENDAR_KWS)
+        assert nlp._count_kws(text, nlp._NOTION_M) == _naive_score(text, nlp.NOTION_KWS)
+        assert nlp._count_kws(text, nlp._GITHUB_M) == _naive_score(text, nlp.GITHUB_KWS)
+
+
+def test_detect_intent_prefers_highest_score():
+    assert nlp.detect_intent("meeting notes").name == "notion"
+    assert nlp.detect_intent("hello there").name == "general"
@@ -0,0 +1,54 @@
+from __future__ import annotations
+import asyncio
+
+import httpx
+
+from src.app.core import http
+from src.app.core.config import settings
+from src.app.providers import notion
+from src.app.providers.notion import NotionProvider
+
+_PAGE = {
+    "object": "page",
+    "url": "https://notion.so/p1",
+    "last_edited_time": "2025-01-01T00:00:00.000Z",
+    "properties": {"Name": {"type": "title", "title": [{"plain_text": "Roadmap"}]}},
+}
+
+
+def _provider(monkeypatch, handler) -> NotionProvider:
+    monkeypatch.setattr(settings, "NOTION_TOKEN", "secret")
+    monkeypatch.setattr(http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return NotionProvider()
+
+
+def test_fetch_serves_repeat_queries_from_cache(monkeypatch):
+    calls: list[bytes] = []
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        calls.append(req.content)
+        return httpx.Response(200, json={"results": [_PAGE]})
+
+    provider = _provider(monkeypatch, handler)
+    first = asyncio.run(provider.fetch("roadmap"))
+    again = asyncio.run(provider.fetch("roadmap"))
+    assert [it.title for it in first] == [it.title for it in again] == ["Roadmap"]
+    assert len(calls) == 1
+    assert b'"page_size":5' in calls[0].replace(b" ", b"")
+
+    asyncio.run(provider.fetch("other"))
+    assert len(calls) == 2
+
+    monkeypatch.setattr(notion, "_CACHE_TTL_S", 0.0)
+    asyncio.run(provider.fetch("roadmap"))
+    assert len(calls) == 3
+
+
+def test_page_title_remembers_title_property_per_database(monkeypatch):
+    provider = _provider(monkeypatch, lambda req: httpx.Response(200, json={"results": []}))
+    parent = {"type": "database_id", "database_id": "db1"}
+    row = {"Status": {"type": "status"}, "Task": {"type": "title", "title": [{"plain_text": "Ship it"}]}}
+    assert provider._page_title({"parent": parent}, row) == "Ship it"
+    assert provider._title_keys == {"db1": "Task"}
+    assert provider._page_title({"parent": parent}, _PAGE["properties"]) == "Roadmap"
+    assert provider._page_title({}, {"Status": {"type": "status"}}) is None
@@ -0,0 +1,28 @@
+from __future__ import annotations
+import asyncio
+
+from src.app.providers.base import fetch_many
+from src.app.providers.calendar import CalendarProvider
+
+
+class _Slow:
+    name = "slow"
+
+    async def fetch(self, query: str, limit: int = 5):
+        await asyncio.sleep(0.01)
+        return ["slow"][:limit]
+
+
+class _Broken:
+    name = "broken"
+
+    async def fetch(self, query: str, limit: int = 5):
+        raise RuntimeError("boom")
+
+
+def test_fetch_many_keeps_provider_order_and_drops_failures():
+    errors: list[BaseException] = []
+    items = asyncio.run(fetch_many([_Slow(), _Broken(), CalendarProvider()], "tomorrow", limit=5, errors=errors))
+    assert items[0] == "slow"
+    assert [str(e) for e in errors] == ["boom"]
+    assert [it.title for it in items[1:]] == ["Project Sync"]
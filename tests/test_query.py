@@ -0,0 +1,110 @@
+from __future__ import annotations
+import time
+
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+from src.app.schemas.query import ContextItem
+
+client = TestClient(app)
+
+
+def test_query_gathers_all_sources():
+    resp = client.post("/query", json={"query": "am I free tomorrow at 3pm?"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["intent"] == "calendar"
+    assert {it["source"] for it in body["context_items"]} == {"calendar", "notion", "github"}
+    assert body["context_items"][0]["source"] == "calendar"
+    assert body["availability"] is not None
+
+
+def test_query_skips_availability_for_non_calendar_intent():
+    body = client.post("/query", json={"query": "open github issue for auth", "no_cache": True}).json()
+    assert body["intent"] == "code"
+    assert body["availability"] is None and body["suggested_slots"] is None
+
+
+def _fake_fan_out(monkeypatch, items, fail: bool = False) -> list[str]:
+    from src.app.routers import query
+
+    calls: list[str] = []
+
+    async def fake(providers, q, limit, *, errors=None):
+        calls.append(q)
+        if fail and errors is not None:
+            errors.append(RuntimeError("boom"))
+        return [ContextItem(**it) for it in items]
+
+    monkeypatch.setattr(query, "fetch_many", fake)
+    monkeypatch.setattr(query, "_RESPONSES", type(query._RESPONSES)())
+    return calls
+
+
+def test_query_response_cache_and_no_cache(monkeypatch):
+    calls = _fake_fan_out(monkeypatch, [{"source": "github", "title": "Fix auth", "snippet": "PR"}])
+    req = {"query": "Open PRs  for auth", "sources": ["github"]}
+
+    first = client.post("/query", json=req).json()
+    again = client.post("/query", json={**req, "query": "open PRS  for AUTH"}).json()
+    assert again == first
+    assert len(calls) == 1
+
+    client.post("/query", json={**req, "no_cache": True})
+    assert len(calls) == 2
+
+
+def test_query_cache_keeps_whitespace_variants_apart(monkeypatch):
+    calls = _fake_fan_out(monkeypatch, [{"source": "github", "title": "Fix auth", "snippet": "PR"}])
+    spaced = client.post("/query", json={"query": "am i  free", "sources": ["github"]}).json()
+    plain = client.post("/query", json={"query": "am i free", "sources": ["github"]}).json()
+    assert spaced["intent"] == "general"
+    assert plain["intent"] == "calendar"
+    assert len(calls) == 2
+
+
+def test_query_does_not_cache_degraded_responses(monkeypatch):
+    req = {"query": "open prs for auth", "sources": ["github"]}
+
+    calls = _fake_fan_out(monkeypatch, [{"source": "github", "title": "(github) fetch error", "snippet": "500"}])
+    client.post("/query", json=req)
+    client.post("/query", json=req)
+    assert len(calls) == 2
+
+    calls = _fake_fan_out(monkeypatch, [{"source": "github", "title": "Fix auth", "snippet": "PR"}], fail=True)
+    client.post("/query", json=req)
+    client.post("/query", json=req)
+    assert len(calls) == 2
+
+
+def test_query_cache_uses_calendar_ttl_when_calendar_is_selected(monkeypatch):
+    from src.app.routers import query
+
+    _fake_fan_out(monkeypatch, [{"source": "notion", "title": "Changelog", "snippet": "page"}])
+    client.post("/query", json={"query": "what changed this week"})
+    client.post("/query", json={"query": "what changed this week", "sources": ["notion"]})
+    ttls = {key[1]: expires - time.monotonic() for key, (expires, _) in query._RESPONSES.items()}
+    assert ttls[("all",)] <= query._RESPONSE_TTL_CALENDAR_S
+    assert ttls[("notion",)] > query._RESPONSE_TTL_CALENDAR_S
+
+
+def test_select_sources_orders_all_by_intent():
+    from src.app.routers.query import _select_sources
+
+    assert _select_sources(("all",), "code") == ("github", "notion", "calendar")
+    assert _select_sources(("all",), "notes") == ("notion", "github", "calendar")
+    assert _select_sources(("github", "calendar"), "notes") == ("github", "calendar")
+
+
+def test_query_drops_only_invalid_provider_items(monkeypatch):
+    from src.app.routers import query
+
+    async def mixed(providers, q, limit, *, errors=None):
+        return [
+            {"source": "calendar", "title": "ok", "snippet": "s"},
+            {"source": "calendar", "snippet": "missing title"},
+        ]
+
+    monkeypatch.setattr(query, "fetch_many", mixed)
+    body = client.post("/query", json={"query": "standup notes", "no_cache": True}).json()
+    assert [it["title"] for it in body["context_items"]] == ["ok"]
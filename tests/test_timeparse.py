@@ -0,0 +1,23 @@
+from __future__ import annotations
+from zoneinfo import ZoneInfo
+
+from src.app.core.timeparse import parse_query_to_windows, parse_slot_intent
+
+TZ = ZoneInfo("America/Chicago")
+
+
+def test_cached_windows_are_stable_and_isolated():
+    first = parse_query_to_windows("am I free tomorrow at 10?", tz=TZ)
+    first.clear()  # mutating a result must not poison the cache
+    again = parse_query_to_windows("am I free tomorrow at 10?", tz=TZ)
+    assert len(again) == 1
+    start, end = again[0]
+    assert start == end and (start.hour, start.minute) == (10, 0)
+
+
+def test_cached_slot_intent_returns_fresh_dict():
+    intent = parse_slot_intent("book 30 min after 15:00 today", tz=TZ)
+    assert intent and intent["mode"] == "after_time"
+    intent["duration_min"] = 999
+    again = parse_slot_intent("book 30 min after 15:00 today", tz=TZ)
+    assert again["duration_min"] == 30